@@ -0,0 +1,225 @@
+# Copyright 2023 Comcast Cable Communications Management, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import contextlib
+import os
+import subprocess
+
+import dbus
+import pytest
+
+from rdkfw_test_helper import (SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE, VERSION_FILE,
+                               BKUP_VERSION_FILE, PDRI_IMAGE_FILE, overwrite_file, remove_file,
+                               swap_file)
+from rdkfw_dbus_helper import (start_daemon, kill_daemon, daemon_responds, iface,
+                               system_bus, to_handler_id, TrackingInterface)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def worker_bus(tmp_path_factory):
+    """
+    Give each pytest-xdist worker a bus of its own.
+
+    The daemon owns a fixed well-known name, so two workers cannot each
+    run one on the shared system bus. Under xdist (pytest -n N --dist
+    loadgroup) a private dbus-daemon is started per worker and
+    DBUS_SYSTEM_BUS_ADDRESS points at it; the test connections and the
+    daemon under test both pick it up. Without xdist this fixture does
+    nothing.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        yield None
+        return
+
+    socket_path = tmp_path_factory.mktemp(f"bus-{worker}") / "socket"
+    address = f"unix:path={socket_path}"
+    bus_proc = subprocess.Popen(["dbus-daemon", "--session", "--nofork",
+                                 f"--address={address}", "--print-address"],
+                                stdout=subprocess.PIPE, text=True)
+    # The address is printed once the bus is accepting connections
+    bus_proc.stdout.readline()
+    os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = address
+    yield address
+    bus_proc.terminate()
+    bus_proc.wait()
+
+
+# Modules that touch files shared system-wide rather than per worker:
+# device.properties, swupdate.conf, /version.txt, the pdri file, the flash
+# script, /opt/CDL, the XConf cache and the swupdate log. Under xdist they
+# all go to one worker, in order, while the modules that only use the
+# per-worker bus (RegisterProcess, UnregisterProcess) run beside them.
+FIRMWARE_FILE_MODULES = frozenset((
+    "test_imagedwnl.py",
+    "test_imagedwnl_error.py",
+    "test_peripheral_imagedwnl.py",
+    "test_certbundle_dwnl.py",
+    "test_dbus_CheckForUpdate.py",
+    "test_dbus_DownloadFirmware.py",
+    "test_dbus_UpdateFirmware.py",
+    "test_pkcs11_fallback.py",
+))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "daemon_restart: restart the module daemon after this test, for tests "
+        "that leave it mid-operation")
+    # Only loadgroup honours xdist_group; any other distribution would run
+    # the firmware modules concurrently against the same files
+    if getattr(config.option, "numprocesses", None) and config.option.dist != "loadgroup":
+        raise pytest.UsageError("Run these tests under xdist with --dist loadgroup, "
+                                f"not --dist {config.option.dist}")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    # Before xdist's own hook, which reads xdist_group into the node ids
+    for item in items:
+        if item.path.name in FIRMWARE_FILE_MODULES:
+            item.add_marker(pytest.mark.xdist_group("firmware_files"))
+
+
+class _DaemonHandle:
+    """
+    The daemon shared by a module's tests.
+
+    proc is None while a daemon started outside the tests is being reused.
+    """
+
+    def __init__(self, proc) -> None:
+        self.proc = proc
+
+    def restart(self) -> None:
+        # start_daemon() also takes down a daemon it did not start
+        if self.proc is not None:
+            kill_daemon(self.proc)
+        self.proc = start_daemon()
+
+
+@pytest.fixture(scope="module")
+def daemon():
+    """
+    Run one rdkFwupdateMgr instance for all tests of a module.
+
+    A daemon that already answers Peer.Ping is reused as-is and left
+    running; only a daemon started here is stopped on teardown.
+
+    Module rather than session scope: modules that still restart the
+    daemon per test would otherwise kill a shared instance.
+    """
+    handle = _DaemonHandle(None if daemon_responds() else start_daemon())
+    yield handle
+    if handle.proc is not None:
+        kill_daemon(handle.proc)
+
+
+@pytest.fixture(autouse=True)
+def _daemon_restart(request):
+    """Give the tests after a daemon_restart-marked test a fresh daemon."""
+    yield
+    handle = request.node.funcargs.get("daemon")
+    if handle is not None and request.node.get_closest_marker("daemon_restart"):
+        handle.restart()
+
+
+@pytest.fixture
+def api(daemon):
+    """
+    Daemon interface for one test.
+
+    Handler ids registered through it are unregistered on teardown, so
+    tests sharing the daemon start from a clean registration table.
+    """
+    interface = TrackingInterface(iface(), system_bus())
+    yield interface
+    interface.unregister_all()
+
+
+@pytest.fixture(scope="module")
+def handler_id(daemon):
+    """
+    Handler id of a "TestApp" registration shared by a module's tests.
+
+    Tests that only need some registered handler take this instead of
+    registering their own; tests about registration itself still do.
+    Yielded as a string, the form the update methods take.
+    """
+    registered = to_handler_id(iface().RegisterProcess("TestApp", "1.0"))
+    yield str(registered)
+    try:
+        iface().UnregisterProcess(registered)
+    except dbus.exceptions.DBusException:
+        # The registration went with a daemon restarted since
+        pass
+
+
+@pytest.fixture
+def swupdate_conf():
+    """
+    Swap one of the prepared XConf configurations in as swupdate.conf.
+
+    Returns a function taking the alternative conf file, e.g.
+    ERR_SWUPDATE_CONF_FILE. The default configuration is put back and the
+    alternative returned to its own name on teardown.
+    """
+    with contextlib.ExitStack() as stack:
+        def use(conf_file):
+            stack.enter_context(swap_file(SWUPDATE_CONF_FILE, conf_file, BKUP_SWUPDATE_CONF_FILE))
+        yield use
+
+
+@pytest.fixture
+def pdri_image():
+    """
+    Set the PDRI image name the upgrader reads from /tmp/pdri_image_file.
+
+    Returns a function taking the image name. The file is left in place on
+    teardown: later tests of the ordered image sequence run the upgrader
+    again relying on it.
+    """
+    def write(image_name):
+        overwrite_file(PDRI_IMAGE_FILE, image_name.encode())
+    return write
+
+
+@pytest.fixture
+def version_txt():
+    """
+    Replace /version.txt for one test.
+
+    Returns a function taking the new content; the original file is put
+    back on teardown, or the written one removed if there was none.
+    """
+    replaced = False
+    backed_up = False
+
+    def write(content):
+        nonlocal replaced, backed_up
+        if not replaced:
+            backed_up = os.path.exists(VERSION_FILE)
+            if backed_up:
+                os.replace(VERSION_FILE, BKUP_VERSION_FILE)
+            replaced = True
+        overwrite_file(VERSION_FILE, content.encode())
+    yield write
+    if backed_up:
+        os.replace(BKUP_VERSION_FILE, VERSION_FILE)
+    elif replaced:
+        remove_file(VERSION_FILE)
@@ -0,0 +1,509 @@
+# Copyright 2023 Comcast Cable Communications Management, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import contextlib
+import os
+import signal
+import subprocess
+import time
+
+import dbus
+import dbus.bus
+import dbus.lowlevel
+import dbus.mainloop
+
+# D-Bus service configuration (must match daemon's actual registration)
+DBUS_SERVICE_NAME: str = "org.rdkfwupdater.Service"
+DBUS_OBJECT_PATH: str = "/org/rdkfwupdater/Service"
+DBUS_INTERFACE: str = "org.rdkfwupdater.Interface"
+
+DAEMON_BINARY: str = "/usr/local/bin/rdkFwupdateMgr"
+# Daemon output is discarded unless RDKFW_TEST_VERBOSE=1, which appends it here
+DAEMON_LOG_FILE: str = "/tmp/rdkfw_daemon.log"
+# Written by the daemon and its download worker; a clean shutdown removes
+# them, a SIGKILL leaves them behind
+DAEMON_PID_FILES: tuple = ("/tmp/DIFD.pid", "/tmp/.curl.pid", "/tmp/.fwdnld.pid")
+
+# Input signatures from the daemon's introspection XML (rdkv_dbus_server.c).
+# Calls are made without introspection, so dbus-python relies on these to
+# marshal arguments such as the uint64 handler id.
+METHOD_SIGNATURES: dict = {
+    "RegisterProcess": "ss",
+    "UnregisterProcess": "t",
+    "CheckForUpdate": "s",
+    "DownloadFirmware": "ssss",
+    "UpdateFirmware": "sssss",
+}
+
+
+_BUS = None
+
+
+def _connect_system_bus():
+    # NULL_MAIN_LOOP: these connections only make blocking calls and never
+    # dispatch signals, so they get no main loop integration at all (not
+    # even a default one set elsewhere in the process).
+    return dbus.bus.BusConnection(dbus.bus.BusConnection.TYPE_SYSTEM,
+                                  mainloop=dbus.mainloop.NULL_MAIN_LOOP)
+
+
+def system_bus():
+    """
+    Return this process's connection to the system bus.
+
+    A dedicated connection rather than the dbus.SystemBus() singleton, so
+    nothing else in the process can attach a main loop or signal matches
+    to it. The address honours DBUS_SYSTEM_BUS_ADDRESS.
+    """
+    global _BUS
+    if _BUS is None:
+        _BUS = _connect_system_bus()
+    return _BUS
+
+
+def _wait_for_name_signal(timeout: float):
+    """
+    Block on NameOwnerChanged until the daemon owns its bus name.
+
+    Runs a GLib main loop on a private connection so the shared connection
+    stays free of main loop integration.
+
+    :return: True/False for ready/timed out, or None if the default GLib
+        context is in use by another thread and cannot be iterated here.
+    """
+    from dbus.mainloop.glib import DBusGMainLoop
+    from gi.repository import GLib
+
+    context = GLib.MainContext.default()
+    if not context.acquire():
+        return None
+    bus = dbus.SystemBus(mainloop=DBusGMainLoop(), private=True)
+    try:
+        loop = GLib.MainLoop()
+        timed_out = []
+
+        def on_owner_changed(name, old_owner, new_owner):
+            if new_owner:
+                loop.quit()
+
+        def on_timeout():
+            timed_out.append(True)
+            loop.quit()
+            return False
+
+        bus.add_signal_receiver(on_owner_changed, signal_name="NameOwnerChanged",
+                                dbus_interface="org.freedesktop.DBus",
+                                arg0=DBUS_SERVICE_NAME)
+        # The name may have been claimed before the match rule was added
+        if bus.name_has_owner(DBUS_SERVICE_NAME):
+            return True
+        source_id = GLib.timeout_add(int(timeout * 1000), on_timeout)
+        loop.run()
+        if not timed_out:
+            GLib.source_remove(source_id)
+        return not timed_out
+    finally:
+        bus.close()
+        context.release()
+
+
+def wait_for_service(timeout: float = 5.0) -> bool:
+    """
+    Wait until the daemon has claimed its well-known name on the bus.
+
+    Wakes up on the NameOwnerChanged signal; falls back to polling
+    NameHasOwner every 50 ms if GLib is unavailable or busy.
+
+    :param timeout: Maximum time to wait, in seconds.
+    :return: True if the name has an owner, False on timeout.
+    """
+    try:
+        ready = _wait_for_name_signal(timeout)
+    except (ImportError, dbus.exceptions.DBusException):
+        ready = None
+    if ready is not None:
+        return ready
+
+    bus = system_bus()
+    deadline = time.monotonic() + timeout
+    while not bus.name_has_owner(DBUS_SERVICE_NAME):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def daemon_responds(timeout: float = 0.2) -> bool:
+    """
+    Check whether a live daemon answers on the bus.
+
+    Uses org.freedesktop.DBus.Peer.Ping, which GDBus answers for any
+    object path without involving the daemon's own handlers.
+
+    :param timeout: Reply timeout, in seconds.
+    :return: True if the ping was answered.
+    """
+    try:
+        system_bus().call_blocking(DBUS_SERVICE_NAME, DBUS_OBJECT_PATH,
+                                   "org.freedesktop.DBus.Peer", "Ping",
+                                   "", (), timeout=timeout)
+        return True
+    except dbus.exceptions.DBusException:
+        return False
+
+
+def kill_running_daemon(timeout: float = 0.5) -> None:
+    """
+    Terminate whichever process currently owns the daemon's bus name.
+
+    The daemon writes no PID file, so the PID is taken from the bus. On a
+    fresh run nothing owns the name and this returns immediately.
+
+    :param timeout: Time to wait after SIGTERM before sending SIGKILL.
+    :return: None
+    """
+    bus = system_bus()
+    if not bus.name_has_owner(DBUS_SERVICE_NAME):
+        return
+    try:
+        pid = int(bus.call_blocking("org.freedesktop.DBus", "/org/freedesktop/DBus",
+                                    "org.freedesktop.DBus", "GetConnectionUnixProcessID",
+                                    "s", (DBUS_SERVICE_NAME,)))
+        os.kill(pid, signal.SIGTERM)
+    except (dbus.exceptions.DBusException, ProcessLookupError):
+        # Owner went away in the meantime
+        return
+
+    # The name is released as soon as the process is gone, which also
+    # covers an unreaped (zombie) child that kill(pid, 0) would still see
+    if not _wait_for_name_release(bus, timeout):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        _wait_for_name_release(bus, timeout)
+    _reap_if_child(pid)
+
+
+def _wait_for_name_release(bus, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while bus.name_has_owner(DBUS_SERVICE_NAME):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def _reap_if_child(pid: int, timeout: float = 1.0) -> None:
+    """
+    Collect the exit status of pid if it is a child of this process.
+
+    A daemon left running by an earlier test is our child; reaping it with
+    waitpid as soon as it exits keeps it from lingering as a zombie.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reaped, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if reaped or time.monotonic() >= deadline:
+            return
+        time.sleep(0.005)
+
+
+def start_daemon(timeout: float = 10.0):
+    """
+    Start the daemon with required arguments.
+
+    The daemon requires 2 arguments:
+        argv[1] = "0" - Retry count (0 for tests)
+        argv[2] = "1" - Trigger type (1 = Bootup)
+
+    Without these arguments, the daemon will exit immediately.
+
+    Returns once the daemon owns its bus name; raises RuntimeError if it
+    exits or does not claim the name within timeout seconds.
+    """
+    # Kill any existing daemon
+    kill_running_daemon()
+
+    # Start daemon with required arguments: retry_count=0, trigger_type=1 (Bootup).
+    # close_fds=False keeps subprocess on its posix_spawn (vfork) path instead
+    # of fork/exec; Python creates its own descriptors non-inheritable anyway.
+    if os.environ.get("RDKFW_TEST_VERBOSE") == "1":
+        sink = open(DAEMON_LOG_FILE, "ab")
+    else:
+        sink = contextlib.nullcontext(subprocess.DEVNULL)
+    with sink as output:
+        proc = subprocess.Popen([DAEMON_BINARY, "0", "1"], close_fds=False,
+                                stdout=output, stderr=output)
+    if not wait_for_service(timeout):
+        returncode = proc.poll()
+        if returncode is not None:
+            raise RuntimeError(f"{DAEMON_BINARY} exited with status {returncode} "
+                               f"before claiming {DBUS_SERVICE_NAME}")
+        stop_daemon(proc)
+        raise RuntimeError(f"{DAEMON_BINARY} did not claim {DBUS_SERVICE_NAME} "
+                           f"within {timeout} s")
+    return proc
+
+
+def stop_daemon(proc, timeout: float = 1.0):
+    """
+    Stop a daemon started by start_daemon().
+
+    Sends SIGTERM and reaps the process as soon as it exits, falling back
+    to SIGKILL if it is still running after timeout seconds.
+    """
+    proc.terminate()
+    deadline = time.monotonic() + timeout
+    while proc.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.005)
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+
+
+def kill_daemon(proc):
+    """
+    Stop a daemon started by start_daemon() without letting it clean up.
+
+    For teardown where the daemon's shutdown path is not under test: a
+    SIGKILL and a reap, then the pid files it would have removed itself.
+    A stale /tmp/DIFD.pid whose pid gets reused by a later daemon would
+    make that daemon believe another instance is running.
+    """
+    proc.kill()
+    proc.wait()
+    for pid_file in DAEMON_PID_FILES:
+        try:
+            os.unlink(pid_file)
+        except FileNotFoundError:
+            pass
+
+
+def to_handler_id(result) -> int:
+    """
+    Convert a RegisterProcess reply to a plain int handler id.
+
+    :param result: The reply, either the bare uint64 or a tuple holding it.
+    :return: The handler id.
+    """
+    return int(result[0] if isinstance(result, (tuple, list)) else result)
+
+
+def unpack_status_reply(result) -> tuple:
+    """
+    Split a DownloadFirmware or UpdateFirmware (sss) reply into its
+    (result, status, message) strings.
+
+    :param result: The reply, either the struct or a bare result string.
+    :return: The three fields; those missing from the reply are "".
+    """
+    fields = result if isinstance(result, (tuple, list)) else (result,)
+    return tuple(str(fields[i]) if i < len(fields) else "" for i in range(3))
+
+
+class _DaemonInterface:
+    """
+    Thin facade that calls the daemon's methods as api.Method(*args).
+
+    Each call goes straight to Connection.call_blocking with the known
+    signature, skipping dbus-python's ProxyObject/Interface layers.
+    Calls are addressed to the well-known name, so the same facade keeps
+    working across daemon restarts. The bound method is built on first
+    use and stored on the instance, so later calls skip __getattr__.
+    """
+
+    def __init__(self, bus) -> None:
+        self._bus = bus
+
+    def __getattr__(self, member):
+        if member not in METHOD_SIGNATURES:
+            raise AttributeError(member)
+        signature = METHOD_SIGNATURES[member]
+
+        def call(*args, timeout=-1.0):
+            return self._bus.call_blocking(DBUS_SERVICE_NAME, DBUS_OBJECT_PATH,
+                                           DBUS_INTERFACE, member, signature,
+                                           args, timeout=timeout)
+        setattr(self, member, call)
+        return call
+
+
+_IFACE = None
+
+
+def iface():
+    """Return the daemon interface for this process's bus connection."""
+    global _IFACE
+    if _IFACE is None:
+        _IFACE = _DaemonInterface(system_bus())
+    return _IFACE
+
+
+class TrackingInterface:
+    """
+    Daemon interface that remembers every handler id it registered.
+
+    Used when one daemon serves several tests: unregister_all() puts the
+    daemon back to its initial state without restarting it.
+    """
+
+    def __init__(self, interface, bus) -> None:
+        self._interface = interface
+        self.bus = bus
+        self.handler_ids = []
+
+    def RegisterProcess(self, *args, **kwargs):
+        result = self._interface.RegisterProcess(*args, **kwargs)
+        self.handler_ids.append(to_handler_id(result))
+        return result
+
+    def register_async(self, process_name: str, lib_version: str) -> "PendingReply":
+        """
+        Send RegisterProcess without waiting for the reply.
+
+        :return: PendingReply whose result() is the handler id; the id is
+            tracked once it has been read.
+        """
+        return _PendingRegistration(self, process_name, lib_version)
+
+    def __getattr__(self, member):
+        return getattr(self._interface, member)
+
+    def unregister_all(self) -> None:
+        """Unregister every handler id registered through this interface."""
+        for handler_id in self.handler_ids:
+            try:
+                self._interface.UnregisterProcess(handler_id)
+            except dbus.exceptions.DBusException:
+                pass
+        self.handler_ids.clear()
+
+
+@contextlib.contextmanager
+def separate_client():
+    """
+    Yield a daemon interface on a new bus connection.
+
+    The connection gets its own unique name, so the daemon treats it as a
+    different client (sender_id) than iface() - no helper process needed.
+    Anything it registered is unregistered before the connection closes.
+    """
+    bus = _connect_system_bus()
+    try:
+        client = TrackingInterface(_DaemonInterface(bus), bus)
+        try:
+            yield client
+        finally:
+            client.unregister_all()
+    finally:
+        bus.close()
+
+
+class PendingReply:
+    """
+    A method call that has been sent to the daemon but whose reply has not
+    been read yet.
+
+    Several of these can be in flight on the same connection at once, so a
+    test that needs N independent answers pays for one round-trip instead
+    of N. No main loop is required: result() blocks on the pending call.
+    """
+
+    def __init__(self, bus, method: str, signature: str, *args) -> None:
+        message = dbus.lowlevel.MethodCallMessage(
+            DBUS_SERVICE_NAME, DBUS_OBJECT_PATH, DBUS_INTERFACE, method
+        )
+        if args:
+            message.append(*args, signature=signature)
+        self._reply = None
+        self._pending = bus.send_message_with_reply(message, self._on_reply)
+
+    def _on_reply(self, reply) -> None:
+        self._reply = reply
+
+    def result(self):
+        """
+        Wait for the reply and return it the way a proxy call would.
+
+        :return: The single return value, or a tuple if there are several.
+        :raises dbus.exceptions.DBusException: If the daemon replied with an error.
+        """
+        self._pending.block()
+        if isinstance(self._reply, dbus.lowlevel.ErrorMessage):
+            raise dbus.exceptions.DBusException(
+                *self._reply.get_args_list(), name=self._reply.get_error_name()
+            )
+        values = self._reply.get_args_list()
+        return values[0] if len(values) == 1 else tuple(values)
+
+
+class _PendingRegistration(PendingReply):
+    """PendingReply for RegisterProcess that reports the id to its tracker."""
+
+    def __init__(self, tracker: TrackingInterface, process_name: str, lib_version: str) -> None:
+        super().__init__(tracker.bus, "RegisterProcess", "ss", process_name, lib_version)
+        self._tracker = tracker
+
+    def result(self):
+        handler_id = super().result()
+        self._tracker.handler_ids.append(int(handler_id))
+        return handler_id
+
+
+def call_many(bus, calls: list, return_exceptions: bool = False) -> list:
+    """
+    Send independent method calls back-to-back and collect the replies.
+
+    All calls go out on the same connection before any reply is read, so
+    they reach the daemon as one client and in the given order.
+
+    :param bus: The D-Bus connection to call from (one client).
+    :param calls: List of (method, signature, args) tuples.
+    :param return_exceptions: If True, a failed call yields its
+        DBusException in the result list instead of raising.
+    :return: List of results, in the same order as calls.
+    """
+    pending = [PendingReply(bus, method, signature, *args)
+               for method, signature, args in calls]
+    results = []
+    for reply in pending:
+        try:
+            results.append(reply.result())
+        except dbus.exceptions.DBusException as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+def register_many(bus, processes: list) -> list:
+    """
+    Register several (process_name, lib_version) pairs back-to-back.
+
+    The daemon has no batched RegisterProcess method, so the calls are
+    pipelined on the connection instead and the replies collected in order.
+
+    :param bus: The D-Bus connection to register from (one client).
+    :param processes: List of (process_name, lib_version) tuples.
+    :return: List of handler ids, in the same order as processes.
+    """
+    results = call_many(bus, [("RegisterProcess", "ss", process) for process in processes])
+    return [to_handler_id(result) for result in results]
@@ -15,10 +15,18 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import contextlib
+import ctypes
+import errno
+import glob
+import logging
+import mmap
 import os
 from pathlib import Path
 import subprocess
 
+logger = logging.getLogger(__name__)
+
 
 RDKFW_PATH: str = "/usr/bin/rdkvfwupgrader"
 SWUPDATE_LOG_FILE: str = "/opt/logs/swupdate.txt"
@@ -36,6 +44,13 @@ CERTBUNDLE_SWUPDATE_CONF_FILE: str = "/opt/certbundle_swupdate.conf"
 RDKFW_ROUTE_FILE: str = "/tmp/route_available"
 RDKFW_DNS_FILE: str = "/etc/resolv.dnsmasq"
 VERSION_FILE: str = "/version.txt"
+BKUP_VERSION_FILE: str = "/bk_version.txt"
+PDRI_IMAGE_FILE: str = "/tmp/pdri_image_file"
+# Left behind by a flashing run; removed before the next upgrader run
+FLASH_STATE_FILES: tuple = ("/tmp/fw_preparing_to_reboot",
+                            "/tmp/currently_running_image_name",
+                            "/opt/cdl_flashed_file_name")
+DEVICE_PROPERTIES_FILE: str = "/etc/device.properties"
 TEST_RFC_PARAM_KEY1: str = "Device.DeviceInfo.X_RDKCENTRAL-COM_RFC.Bootstrap.OsClass"
 TEST_RFC_PARAM_VAL1: str = "default"
 RDKFW_XCONF_URL: str = "https://mockxconf:50052/firmwareupdate/getfirmwaredata"
@@ -50,6 +65,20 @@ RDKFW_XCONF_404PERIPHERAL_URL: str = "https://mockxconf:50052/firmwareupdate/get
 RDKFW_XCONF_CERTBUNDLE_URL: str = "https://mockxconf:50052/firmwareupdate/getcertbundlefirmwaredata"
 
 
+# Encoded once; every test module writes the same device.properties
+_DEVICE_PROPERTIES: bytes = (
+    "DEVICE_NAME=DEV_CONTAINER\n"
+    "DEVICE_TYPE=mediaclient\n"
+    "DIFW_PATH=/opt/CDL\n"
+    "ENABLE_MAINTENANCE=false\n"
+    "MODEL_NUM=ABCD\n"
+    "ENABLE_SOFTWARE_OPTOUT=false\n"
+    "BUILD_TYPE=VBN\n"
+    "ESTB_INTERFACE=eth0\n"
+    "PDRI_ENABLED=true\n"
+).encode()
+
+
 def write_on_file(file: str, content: str) -> None:
     """
     Write or append content to a file.
@@ -58,16 +87,60 @@ def write_on_file(file: str, content: str) -> None:
     :param content: The content to write or append.
     :return: None
     """
-    if not os.path.exists(file):
-        with open(file, 'w') as f:
-            f.write(content)
-    else:
-        if os.path.getsize(file) == 0:
-            with open(file, 'w') as f:
-                f.write(content)
-        else:
-            with open(file, 'a') as f:
-                f.write('\n' + content)
+    fd = os.open(file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        # Non-empty files get the content on a new line; either way the
+        # whole payload goes out in a single write
+        data = content.encode()
+        if os.fstat(fd).st_size:
+            data = b'\n' + data
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def overwrite_file(file: str, data: bytes) -> None:
+    """
+    Replace the content of a file with the given bytes.
+
+    :param file: The path to the file, created if missing.
+    :param data: The new content.
+    :return: None
+    """
+    fd = os.open(file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def has_content(file: str, data: bytes) -> bool:
+    """
+    Check whether a file holds exactly the given bytes.
+
+    :param file: The path to the file.
+    :param data: The expected content.
+    :return: True if the file exists with that content, False otherwise.
+    """
+    try:
+        # A size mismatch settles it without reading the file
+        if os.stat(file).st_size != len(data):
+            return False
+        with open(file, 'rb') as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_device_prop() -> None:
+    """
+    Write the device.properties the daemon under test reads, unless it is
+    already in place.
+
+    :return: None
+    """
+    if not has_content(DEVICE_PROPERTIES_FILE, _DEVICE_PROPERTIES):
+        overwrite_file(DEVICE_PROPERTIES_FILE, _DEVICE_PROPERTIES)
 
 
 def get_FWversion() -> str | None:
@@ -101,8 +174,99 @@ def remove_file(file_name: str) -> None:
     :param file_name: The path to the file to remove.
     :return: None
     """
-    if os.path.exists(file_name):
-        os.remove(file_name)
+    try:
+        os.unlink(file_name)
+    except FileNotFoundError:
+        pass
+
+
+def remove_files(*file_names: str) -> None:
+    """
+    Remove each of the given files, skipping those that do not exist.
+
+    :param file_names: The paths of the files to remove.
+    :return: None
+    """
+    for file_name in file_names:
+        remove_file(file_name)
+
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+def _load_renameat2():
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return None
+    renameat2.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p,
+                          ctypes.c_uint)
+    renameat2.restype = ctypes.c_int
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
+
+
+def exchange_files(file_a: str, file_b: str) -> bool:
+    """
+    Atomically swap two existing files with renameat2(RENAME_EXCHANGE).
+
+    :param file_a: The first file.
+    :param file_b: The second file.
+    :return: True if swapped, False if the libc, kernel or filesystem does
+             not support the exchange (nothing has been moved then).
+    """
+    if _renameat2 is None:
+        return False
+    if _renameat2(_AT_FDCWD, os.fsencode(file_a), _AT_FDCWD, os.fsencode(file_b),
+                  _RENAME_EXCHANGE) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), file_a, None, file_b)
+
+
+@contextlib.contextmanager
+def swap_file(main_file: str, alt_file: str, backup_file: str):
+    """
+    Put alt_file in place of main_file for the duration of a with block.
+
+    Where renameat2 is available the two files trade places in one atomic
+    step each way, so main_file never goes missing. Otherwise main_file is
+    parked at backup_file meanwhile. Both files are moved back on exit,
+    even if the block raises.
+
+    Like rename_file, a missing file is logged rather than raised: without
+    alt_file nothing is swapped, and without main_file alt_file is moved
+    in and back out with no backup to restore.
+
+    :param main_file: The file to replace.
+    :param alt_file: The file to use instead.
+    :param backup_file: Where main_file is kept if it cannot be exchanged.
+    """
+    if not os.path.exists(alt_file):
+        logger.warning(f"The file {alt_file} does not exist; {main_file} left in place.")
+        yield
+        return
+    has_main = os.path.exists(main_file)
+    exchanged = has_main and exchange_files(main_file, alt_file)
+    if not exchanged:
+        if has_main:
+            rename_file(main_file, backup_file)
+        rename_file(alt_file, main_file)
+    logger.info(f"Swapped {alt_file} in for {main_file}")
+    try:
+        yield
+    finally:
+        if exchanged:
+            exchange_files(main_file, alt_file)
+        else:
+            rename_file(main_file, alt_file)
+            if has_main:
+                rename_file(backup_file, main_file)
 
 
 def rename_file(old_file_name: str, new_file_name: str) -> None:
@@ -115,42 +279,40 @@ def rename_file(old_file_name: str, new_file_name: str) -> None:
     """
     try:
         os.rename(old_file_name, new_file_name)
-        print(f"Renamed {old_file_name} to {new_file_name}")
+        logger.info(f"Renamed {old_file_name} to {new_file_name}")
     except FileNotFoundError:
-        print(f"The file {old_file_name} does not exist.")
+        logger.warning(f"The file {old_file_name} does not exist.")
     except PermissionError:
-        print(f"Permission denied: can't rename {old_file_name}")
+        logger.warning(f"Permission denied: can't rename {old_file_name}")
     except Exception as e:
-        print(f"Error renaming file: {e}")
+        logger.error(f"Error renaming file: {e}")
 
 
 def grep_log_file(log_file: str, search_string: str) -> bool:
     """
-    Perform a recursive search for the given string in the specified log file(s).
+    Search for the given string in the specified log file and its rotations.
+
+    Every file matching log_file* is mapped read-only and searched in place,
+    so the log is neither read line by line nor handed to a grep process.
 
     :param log_file: The log file or log file pattern to search.
-    :param search_string: The string to search for.
+    :param search_string: The literal string to search for.
     :return: True if the string is found, False otherwise.
     """
-    try:
-        result = subprocess.run(
-            f'grep -r "{search_string}" {log_file}*',
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-
-        if result.returncode == 0:
-            return True
-        else:
-            print(
-                f"grep returned no matches. stdout: {result.stdout}, stderr: {result.stderr}"
-            )
-            return False
-    except Exception as e:
-        print(f"An error occurred while running grep: {e}")
-        return False
+    needle = search_string.encode()
+    for path in sorted(glob.glob(f"{log_file}*")):
+        try:
+            with open(path, "rb") as f:
+                # mmap refuses empty files, and they cannot match anyway
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(needle) != -1:
+                        return True
+        except OSError as e:
+            logger.warning(f"Could not search {path}: {e}")
+    logger.info(f"'{search_string}' not found in {log_file}*")
+    return False
 
 
 def fw_run_binary() -> None:
@@ -158,18 +320,17 @@ def fw_run_binary() -> None:
     Executes the RFC Manager binary.
 
     This function attempts to run the RFC Manager specified by RFC_MGR_PATH.
-    It captures both standard output and standard error. If an exception occurs
-    during the execution, it prints an error message indicating what went wrong.
+    Its standard output and standard error are discarded; the tests check the
+    log files instead. If an exception occurs during the execution, it logs an
+    error message indicating what went wrong.
 
     Returns:
         None
     """
     try:
-        result = subprocess.run(
-            [RDKFW_PATH], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-        )
+        subprocess.run([RDKFW_PATH], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except Exception as e:
-        print(f"An error occurred while running {RDKFW_PATH}: {e}")
+        logger.error(f"An error occurred while running {RDKFW_PATH}: {e}")
 
 
 def initial_rdkfw_setup():
@@ -206,10 +367,8 @@ def initial_rdkfw_setup():
     # /opt/secure/RFC directory
     
     os.makedirs("/lib/rdk/", exist_ok=True)
-    route_file = Path("/lib/rdk/imageFlasher.sh")
-    route_file.touch(exist_ok=True)
-    write_on_file("/lib/rdk/imageFlasher.sh", "#!/bin/bash\nexit 0")
-    os.chmod(route_file, 0o777)
+    overwrite_file("/lib/rdk/imageFlasher.sh", b"#!/bin/bash\nexit 0")
+    os.chmod("/lib/rdk/imageFlasher.sh", 0o777)
     
     # RFC Prev FW Version
     #write_on_file(RFC_SEC_DIR+".version", get_FWversion() + "_PREV")
@@ -23,25 +23,17 @@ import os
 from rdkfw_test_helper import *
 
 @pytest.mark.run(order=19)
-def test_dwnl_certbundle():
-    remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/pdri_image_file")
-    remove_file("/tmp/downloaded_peripheral_versions.txt")
-    remove_file("/opt/CDL/AB11-20_firmware_5103.3.4.tgz")
-    pdri_file = Path("/tmp/pdri_image_file")
-    pdri_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_fir_test.bin")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(CERTBUNDLE_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, CERTBUNDLE_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/currently_running_image_name")
-    remove_file("/opt/cdl_flashed_file_name")
-    remove_file("/tmp/downloaded_peripheral_versions.txt")
-    remove_file("/opt/CDL/AB11-20_firmware_5103.3.4.tgz")
-    assert result.returncode == 0
+def test_dwnl_certbundle(pdri_image, swupdate_conf):
+    remove_files("/tmp/fw_preparing_to_reboot",
+                 "/tmp/downloaded_peripheral_versions.txt",
+                 "/opt/CDL/AB11-20_firmware_5103.3.4.tgz")
+    pdri_image("ABCD_PDRI_fir_test.bin")
+    swupdate_conf(CERTBUNDLE_SWUPDATE_CONF_FILE)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    remove_files(*FLASH_STATE_FILES,
+                 "/tmp/downloaded_peripheral_versions.txt",
+                 "/opt/CDL/AB11-20_firmware_5103.3.4.tgz")
+    assert rc == 0
 
 @pytest.mark.run(order=20)
 def test_dwnl_certbundle_verify():
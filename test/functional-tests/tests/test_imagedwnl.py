@@ -21,145 +21,77 @@ import os
 
 from rdkfw_test_helper import *
 
-def write_device_prop():
-    file_path = "/etc/device.properties"
-    data = """DEVICE_NAME=DEV_CONTAINER
-DEVICE_TYPE=mediaclient
-DIFW_PATH=/opt/CDL
-ENABLE_MAINTENANCE=false
-MODEL_NUM=ABCD
-ENABLE_SOFTWARE_OPTOUT=false
-BUILD_TYPE=VBN
-ESTB_INTERFACE=eth0
-PDRI_ENABLED=true
-"""
-
-    try:
-        # Open the file in write mode
-        with open(file_path, "w") as file:
-            file.write(data)
-        print(f"Successfully written to {file_path}")
-
-    except PermissionError:
-        print(f"Permission denied: You need root privileges to write to {file_path}")
-        print("Try running the script with sudo: sudo python script.py")
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-@pytest.mark.run(order=1)
-def test_dwnl_firmware_test():
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap():
+    """Prepare the device files the upgrader needs, once for the image tests."""
     initial_rdkfw_setup()
     write_device_prop()
-    remove_file("/tmp/pdri_image_file")
+
+@pytest.mark.run(order=1)
+def test_dwnl_firmware_test(pdri_image):
     remove_file("/tmp/.xconfssrdownloadurl")
-    route_file = Path("/tmp/pdri_image_file")
-    route_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_img")
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    assert result.returncode == 0
+    pdri_image("ABCD_PDRI_img")
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    assert rc == 0
 
 @pytest.mark.run(order=2)
 def test_rdm_trigger_check():
-   if os.path.exists("/tmp/.xconfssrdownloadurl"):
-       res = 0
-   else:
-       res = 1
-   assert res == 0
+    assert os.path.exists("/tmp/.xconfssrdownloadurl"), "Expected /tmp/.xconfssrdownloadurl to be created."
 
 @pytest.mark.run(order=3)
 def test_waiting_for_reboot():
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    assert result.returncode == 1
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    assert rc == 1
 
 @pytest.mark.run(order=4)
 def test_flash_fail():
-    remove_file("/lib/rdk/imageFlasher.sh")
-    route_file = Path("/lib/rdk/imageFlasher.sh")
-    route_file.touch(exist_ok=True)
-    write_on_file("/lib/rdk/imageFlasher.sh", "#!/bin/bash\nexit 1")
-    os.chmod(route_file, 0o777)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    remove_file("/lib/rdk/imageFlasher.sh")
-    route_file = Path("/lib/rdk/imageFlasher.sh")
-    route_file.touch(exist_ok=True)
-    write_on_file("/lib/rdk/imageFlasher.sh", "#!/bin/bash\nexit 0")
-    os.chmod(route_file, 0o777)
-    assert result.returncode == 0
+    overwrite_file("/lib/rdk/imageFlasher.sh", b"#!/bin/bash\nexit 1")
+    os.chmod("/lib/rdk/imageFlasher.sh", 0o777)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    overwrite_file("/lib/rdk/imageFlasher.sh", b"#!/bin/bash\nexit 0")
+    assert rc == 0
 
 @pytest.mark.run(order=5)
-def test_http_404():
+def test_http_404(swupdate_conf):
     remove_file("/tmp/.xconfssrdownloadurl")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(ERR_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
+    swupdate_conf(ERR_SWUPDATE_CONF_FILE)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
     remove_file("/tmp/fw_preparing_to_reboot")
-    rename_file(SWUPDATE_CONF_FILE, ERR_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    assert result.returncode == 0
+    assert rc == 0
 
 @pytest.mark.run(order=6)
 def test_rdm_trigger_http_404():
-   if os.path.exists("/tmp/.xconfssrdownloadurl"):
-       res = 0
-   else:
-       res = 1
-   assert res == 0
+    assert os.path.exists("/tmp/.xconfssrdownloadurl"), "Expected /tmp/.xconfssrdownloadurl to be created."
 
 @pytest.mark.run(order=7)
-def test_no_upgrade():
-    remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/pdri_image_file")
-    pdri_file = Path("/tmp/pdri_image_file")
-    pdri_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_firmware_test.bin")
-    rename_file("/version.txt", "/bk_version.txt")
-    version_file = Path("/version.txt")
-    version_file.touch(exist_ok=True)
-    write_on_file("/version.txt", "imagename:ABCD_firmware_test.bin")
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
+def test_no_upgrade(pdri_image, version_txt):
     remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/currently_running_image_name")
-    remove_file("/opt/cdl_flashed_file_name")
-    rename_file("/bk_version.txt", "/version.txt")
-    assert result.returncode == 0
+    pdri_image("ABCD_PDRI_firmware_test.bin")
+    version_txt("imagename:ABCD_firmware_test.bin")
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    remove_files(*FLASH_STATE_FILES)
+    assert rc == 0
 
 @pytest.mark.run(order=8)
-def test_delay_dwnl():
+def test_delay_dwnl(pdri_image, swupdate_conf):
     remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/pdri_image_file")
-    pdri_file = Path("/tmp/pdri_image_file")
-    pdri_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_firmware_test.bin")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(DELAYDWNL_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, DELAYDWNL_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/currently_running_image_name")
-    remove_file("/opt/cdl_flashed_file_name")
-    assert result.returncode == 0
+    pdri_image("ABCD_PDRI_firmware_test.bin")
+    swupdate_conf(DELAYDWNL_SWUPDATE_CONF_FILE)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    remove_files(*FLASH_STATE_FILES)
+    assert rc == 0
 
 @pytest.mark.run(order=9)
-def test_fallback_codebig():
+def test_delay_dwnl_verify():
     ERROR_MSG1 = "isDelayFWDownloadActive: Device configured with download delay of 1 minutes"
     assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
 
 @pytest.mark.run(order=10)
-def test_rebooten_dwnl():
-    remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/pdri_image_file")
-    pdri_file = Path("/tmp/pdri_image_file")
-    pdri_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_firmware_test.bin")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(REBOOT_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, REBOOT_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
+def test_rebooten_dwnl(pdri_image, swupdate_conf):
     remove_file("/tmp/fw_preparing_to_reboot")
-    remove_file("/tmp/currently_running_image_name")
-    remove_file("/opt/cdl_flashed_file_name")
+    pdri_image("ABCD_PDRI_firmware_test.bin")
+    swupdate_conf(REBOOT_SWUPDATE_CONF_FILE)
+    subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+    remove_files(*FLASH_STATE_FILES)
     ERROR_MSG1 = "sleep for 2 sec to send reboot pending notification"
     assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
@@ -22,57 +22,26 @@ import os
 
 from rdkfw_test_helper import *
 
+# The alternative XConf confs differ only in the response the upgrader gets
+# back; each entry lists the log lines that show it was handled, or none
+# where only the exit status is checked
 @pytest.mark.run(order=11)
-def test_dwnl_firmware_retry_test():
-    remove_file("/tmp/pdri_image_file")
+@pytest.mark.parametrize("conf_file, expected_msgs", [
+    pytest.param(UNRESOLVED_SWUPDATE_CONF_FILE,
+                 ("retryDownload : Direct Image upgrade connection return: retry=2",
+                  "fallBack : fall back Codebig Download"),
+                 id="retry"),
+    pytest.param(INVALID_SWUPDATE_CONF_FILE, (), id="error"),
+    pytest.param(INVALIDPCI_SWUPDATE_CONF_FILE, ("Image configured is not of model",),
+                 id="invalidpci"),
+])
+def test_dwnl_firmware_variant(conf_file, expected_msgs, pdri_image, swupdate_conf):
     remove_file("/tmp/.xconfssrdownloadurl")
-    route_file = Path("/tmp/pdri_image_file")
-    route_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file ", "ABCD_PDRI_img")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(UNRESOLVED_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, UNRESOLVED_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-
-    ERROR_MSG1 = "retryDownload : Direct Image upgrade connection return: retry=2"
-    assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
-    #assert result.returncode == 0
-
-@pytest.mark.run(order=12)
-def test_fallback_codebig():
-    ERROR_MSG1 = "fallBack : fall back Codebig Download"
-    assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
-
-@pytest.mark.run(order=13)
-def test_dwnl_firmware_error_test():
-    remove_file("/tmp/pdri_image_file")
-    remove_file("/tmp/.xconfssrdownloadurl")
-    route_file = Path("/tmp/pdri_image_file")
-    route_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file ", "ABCD_PDRI_img")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(INVALID_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, INVALID_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-
-    #ERROR_MSG1 = "retryDownload : Direct Image upgrade connection return: retry=2"
-    #assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
-    assert result.returncode == 0
-
-@pytest.mark.run(order=14)
-def test_dwnl_firmware_invalidpci_test():
-    remove_file("/tmp/pdri_image_file")
-    remove_file("/tmp/.xconfssrdownloadurl")
-    route_file = Path("/tmp/pdri_image_file")
-    route_file.touch(exist_ok=True)
-    write_on_file("/tmp/pdri_image_file ", "ABCD_PDRI_img")
-    rename_file(SWUPDATE_CONF_FILE, BKUP_SWUPDATE_CONF_FILE)
-    rename_file(INVALIDPCI_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
-    rename_file(SWUPDATE_CONF_FILE, INVALIDPCI_SWUPDATE_CONF_FILE)
-    rename_file(BKUP_SWUPDATE_CONF_FILE, SWUPDATE_CONF_FILE)
-
-    ERROR_MSG1 = "Image configured is not of model"
-    assert grep_log_file("/opt/logs/swupdate.txt.0", ERROR_MSG1), f"Expected '{ERROR_MSG1}' in log file."
+    pdri_image("ABCD_PDRI_img")
+    swupdate_conf(conf_file)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
+
+    for expected_msg in expected_msgs:
+        assert grep_log_file("/opt/logs/swupdate.txt.0", expected_msg), f"Expected '{expected_msg}' in log file."
+    if not expected_msgs:
+        assert rc == 0
@@ -20,16 +20,12 @@ import subprocess
 import os
 import time
 import json
-import dbus
 import shutil
-from pathlib import Path
-from rdkfw_test_helper import remove_file, write_on_file, initial_rdkfw_setup
+from rdkfw_test_helper import PDRI_IMAGE_FILE, remove_file, overwrite_file, initial_rdkfw_setup
+from rdkfw_dbus_helper import (start_daemon, kill_daemon, kill_running_daemon, iface,
+                               to_handler_id)
 
 # Constants
-DBUS_SERVICE_NAME = "org.rdkfwupdater.Service"
-DBUS_OBJECT_PATH = "/org/rdkfwupdater/Service"
-DBUS_INTERFACE = "org.rdkfwupdater.Interface"
-DAEMON_BINARY = "/usr/local/bin/rdkFwupdateMgr"
 CLEANUP_FILES = [
     "/tmp/dnldmgr_status.txt",
     "/opt/curl_progress",
@@ -59,35 +55,6 @@ def cleanup_daemon_files():
         remove_file(f)
 
 
-def start_daemon_process():
-    """Start D-Bus daemon"""
-    subprocess.run(['pkill', '-9', '-f', 'rdkFwupdateMgr'], capture_output=True)
-    time.sleep(0.5)
-    proc = subprocess.Popen([DAEMON_BINARY, "0", "1"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    time.sleep(3)
-    if proc.poll() is not None:
-        stdout, stderr = proc.communicate(timeout=1)
-        raise RuntimeError(
-            f"Daemon failed to start (exit code: {proc.returncode})\n"
-            f"stdout: {stdout.decode('utf-8', errors='ignore')}\n"
-            f"stderr: {stderr.decode('utf-8', errors='ignore')}"
-        )
-    return proc
-
-
-def stop_daemon_process(proc=None):
-    """Stop D-Bus daemon"""
-    if proc:
-        proc.terminate()
-        try:
-            proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait()
-    subprocess.run(['pkill', '-9', '-f', 'rdkFwupdateMgr'], capture_output=True)
-    time.sleep(0.5)
-
-
 @pytest.fixture(scope="module")
 def backup_reference_cert():
     """Backup and remove reference.p12 for fallback testing"""
@@ -124,27 +91,24 @@ def test_fallback_firmware_download(backup_reference_cert):
     initial_rdkfw_setup()
     write_config_files()
     cleanup_daemon_files()
-    daemon_proc = start_daemon_process()
+    daemon_proc = start_daemon()
     
     try:
-        bus = dbus.SystemBus()
-        fw_interface = dbus.Interface(
-            bus.get_object(DBUS_SERVICE_NAME, DBUS_OBJECT_PATH), 
-            DBUS_INTERFACE
-        )
+        fw_interface = iface()
         
         result = fw_interface.RegisterProcess("FallbackTest", "1.0")
-        handler_id = str(result[0] if isinstance(result, tuple) else result)
+        handler_id = str(to_handler_id(result))
         assert int(handler_id) > 0
         
         fw_interface.CheckForUpdate(handler_id)
         time.sleep(3)
         
         # Verify daemon still running (no cert crash)
-        assert subprocess.run(['pgrep', '-f', 'rdkFwupdateMgr'], capture_output=True).returncode == 0
+        assert daemon_proc.poll() is None, \
+            f"Daemon exited with status {daemon_proc.returncode}"
         
     finally:
-        stop_daemon_process(daemon_proc)
+        kill_daemon(daemon_proc)
         cleanup_daemon_files()
 
 
@@ -154,20 +118,17 @@ def test_fallback_rdkvfwupgrader_direct(backup_reference_cert):
     """Test rdkvfwupgrader binary directly with fallback certificates"""
     # Ensure any lingering daemon from previous test is fully gone
     # (previously test_verify_no_pkcs11_patch_activation provided natural delay)
-    subprocess.run(['pkill', '-9', '-f', 'rdkFwupdateMgr'], capture_output=True)
+    kill_running_daemon()
     subprocess.run(['pkill', '-9', '-f', 'rdkvfwupgrader'], capture_output=True)
     time.sleep(5)  # Allow daemon and its curl connections to fully release
 
     initial_rdkfw_setup()
     write_config_files()
     
-    for f in ["/tmp/pdri_image_file", "/tmp/.xconfssrdownloadurl"]:
-        remove_file(f)
-    
-    Path("/tmp/pdri_image_file").touch()
-    write_on_file("/tmp/pdri_image_file", "ABCD_PDRI_img")
+    remove_file("/tmp/.xconfssrdownloadurl")
+    overwrite_file(PDRI_IMAGE_FILE, b"ABCD_PDRI_img")
     
-    result = subprocess.run(['rdkvfwupgrader', '0', '1'], stdout=subprocess.PIPE)
+    rc = subprocess.call(['rdkvfwupgrader', '0', '1'], stdout=subprocess.DEVNULL)
 
-    assert result.returncode == 0
+    assert rc == 0
     assert os.path.exists("/tmp/.xconfssrdownloadurl")